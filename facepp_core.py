@@ -0,0 +1,220 @@
+"""
+facepp_core.py
+
+Shared Face++ helpers used by the gesture scripts: reading credentials,
+encoding frames, calling the gesture API and parsing its response.
+"""
+
+import json
+import atexit
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+# Optional: PyTurboJPEG talks to libjpeg-turbo directly, which encodes
+# noticeably faster than OpenCV's bundled libjpeg on most builds
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _TURBO_JPEG = TurboJPEG()
+except Exception:  # not installed, or the libturbojpeg library is missing
+    _TURBO_JPEG = None
+
+# Optional: orjson parses the API response several times faster than the
+# standard library json module
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Face++ US endpoint for gesture recognition
+FACEPP_US_HOST_URL = "https://api-us.faceplusplus.com/"
+FACEPP_US_GESTURE_URL = FACEPP_US_HOST_URL + "humanbodypp/v1/gesture"
+
+# Text file that stores your API key and secret (two lines)
+KEYS_FILE = "facepp_keys.txt"
+
+# String labels that mean "thumbs up", once lower-cased with every
+# underscore and space removed by _LABEL_SEPARATORS
+_THUMB_LABELS = frozenset({"thumbup", "thumbsup"})
+_LABEL_SEPARATORS = str.maketrans("", "", "_ ")
+
+# Frames are shrunk to this width before upload; Face++ doesn't need more
+UPLOAD_MAX_WIDTH = 640
+
+# JPEG quality used for uploaded frames (0-100)
+JPEG_QUALITY = 75
+
+# Shared HTTP session so every API call reuses the same TCP/TLS connection
+# instead of doing a fresh DNS lookup and handshake each time
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive"})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0))
+atexit.register(_SESSION.close)
+
+
+def read_keys_from_file(path: str) -> Tuple[str, str]:
+    """
+    Reads Face++ credentials from a text file.
+    """
+    p = Path(path)
+
+    if not p.exists():
+        raise FileNotFoundError(
+            f"Keys file not found: {p.resolve()}\n"
+            "Create it with two lines:\n"
+            "API_KEY\\nAPI_SECRET"
+        )
+
+    lines = [ln.strip() for ln in p.read_text(encoding="utf-8").splitlines() if ln.strip()]
+
+    if len(lines) < 2:
+        raise ValueError(
+            "Keys file must contain at least 2 non-empty lines:\n"
+            "Line 1 = API_KEY\nLine 2 = API_SECRET"
+        )
+
+    return lines[0], lines[1]
+
+
+def shrink_to_width(bgr_frame: np.ndarray, max_width: int) -> np.ndarray:
+    """
+    Downscales a frame to max_width (keeping aspect ratio) if it is wider.
+    """
+    h, w = bgr_frame.shape[:2]
+    if w <= max_width:
+        return bgr_frame
+
+    scale = max_width / w
+    return cv2.resize(bgr_frame, (max_width, int(h * scale)), interpolation=cv2.INTER_AREA)
+
+
+def frame_dhash(bgr_frame: np.ndarray) -> int:
+    """
+    Computes a 64-bit difference hash of the frame for cheap motion checks.
+    """
+    small = cv2.resize(bgr_frame, (9, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    # One bit per pixel: is it brighter than its left neighbour?
+    bits = np.packbits(gray[:, 1:] > gray[:, :-1])
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def encode_jpeg(bgr_frame: np.ndarray, quality: int = JPEG_QUALITY) -> Optional[Union[bytes, memoryview]]:
+    """
+    Encodes a BGR frame as JPEG at the given quality, using libjpeg-turbo
+    when available.
+
+    Returns a bytes-like object (bytes or a memoryview over OpenCV's output
+    buffer) that can be posted as-is, or None if encoding failed.
+    """
+    if _TURBO_JPEG is not None:
+        return _TURBO_JPEG.encode(
+            bgr_frame,
+            quality=quality,
+            pixel_format=TJPF_BGR,
+            jpeg_subsample=TJSAMP_420
+        )
+
+    ok, jpg = cv2.imencode(
+        ".jpg",
+        bgr_frame,
+        [int(cv2.IMWRITE_JPEG_QUALITY), quality, int(cv2.IMWRITE_JPEG_OPTIMIZE), 1]
+    )
+    if not ok:
+        return None
+
+    # requests/urllib3 accept any buffer for file content, so skip the copy
+    return jpg.data
+
+
+def warm_up_connection() -> None:
+    """
+    Opens the pooled connection to Face++ ahead of the first real request.
+
+    A cheap HEAD request does the DNS lookup and TCP/TLS handshake up front,
+    so the first gesture upload doesn't pay for them.
+    """
+    try:
+        _SESSION.head(FACEPP_US_HOST_URL, timeout=5)
+    except requests.RequestException as e:
+        print(f"Could not pre-connect to Face++: {e}")
+
+
+def post_to_facepp_gesture(api_key: str, api_secret: str, bgr_frame: np.ndarray,
+                           quality: int = JPEG_QUALITY) -> Optional[dict]:
+    """
+    Sends the captured webcam frame to Face++ Gesture API, JPEG-encoded at
+    the given quality, over the shared keep-alive session.
+    """
+    try:
+        # Downscale first: fewer pixels to encode and fewer bytes to upload
+        bgr_frame = shrink_to_width(bgr_frame, UPLOAD_MAX_WIDTH)
+
+        jpg_bytes = encode_jpeg(bgr_frame, quality)
+        if jpg_bytes is None:
+            return None
+
+        # Any: requests posts a memoryview as-is, but its stubs only list bytes
+        files: Dict[str, Tuple[str, Any, str]] = {
+            "image_file": ("frame.jpg", jpg_bytes, "image/jpeg")
+        }
+
+        data = {
+            "api_key": api_key,
+            "api_secret": api_secret
+        }
+
+        resp = _SESSION.post(FACEPP_US_GESTURE_URL, data=data, files=files, timeout=10)
+
+        payload = _json_loads(resp.content)
+
+        if resp.status_code != 200 or "error_message" in payload:
+            print(f"API error: {payload.get('error_message', 'Unknown error')}")
+            return None
+
+        return payload
+
+    except Exception as e:
+        print(f"Request error: {e}")
+        return None
+
+
+def detect_thumbs_up(payload: Optional[dict]) -> bool:
+    """
+    Checks if a thumbs-up gesture was detected in the Face++ response.
+    """
+    if not payload:
+        return False
+
+    hands = payload.get("hands") or payload.get("hand_gestures") or payload.get("result") or []
+
+    if isinstance(hands, dict):
+        hands = hands.get("hands", [])
+
+    if not hands:
+        return False
+
+    for hand in hands:
+        gesture = hand.get("gesture") or hand.get("gesture_type") or hand.get("label")
+        
+        if isinstance(gesture, dict):
+            thumb_up_score = gesture.get("thumb_up", 0)
+            
+            if thumb_up_score > 50:
+                print(f"👍 Thumbs up detected! Confidence: {thumb_up_score}%")
+                return True
+        
+        elif isinstance(gesture, str):
+            if gesture.lower().translate(_LABEL_SEPARATORS) in _THUMB_LABELS:
+                print(f"👍 Thumbs up detected!")
+                return True
+
+    return False
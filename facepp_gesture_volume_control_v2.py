@@ -5,153 +5,155 @@ Uses system commands to control volume instead of keyboard simulation.
 Works on Windows, macOS, and Linux.
 """
 
+import os
 import sys
-import json
 import time
+import shutil
 import platform
+import functools
+import contextlib
 import subprocess
-from pathlib import Path
+import threading
+from collections import deque
 
 import cv2
-import requests
 
-
-# Face++ US endpoint for gesture recognition
-FACEPP_US_GESTURE_URL = "https://api-us.faceplusplus.com/humanbodypp/v1/gesture"
-
-# Text file that stores your API key and secret (two lines)
-KEYS_FILE = "facepp_keys.txt"
-
-# How long to wait between API calls (seconds)
-API_CALL_INTERVAL = 2.0
+from facepp_core import (
+    KEYS_FILE,
+    read_keys_from_file,
+    shrink_to_width,
+    frame_dhash,
+    warm_up_connection,
+    post_to_facepp_gesture,
+    detect_thumbs_up,
+)
+
+# Optional (Windows only): pycaw controls the speaker endpoint in-process,
+# which avoids starting PowerShell on every volume change
+try:
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+except Exception:  # not installed, or not on Windows
+    AudioUtilities = None
+
+
+# Adaptive wait between API calls (seconds): start at API_INTERVAL_START,
+# back off by API_INTERVAL_BACKOFF while nothing is detected (up to
+# API_INTERVAL_MAX), and drop to API_INTERVAL_ACTIVE right after a thumbs up
+API_INTERVAL_START = 0.5
+API_INTERVAL_ACTIVE = 0.3
+API_INTERVAL_MAX = 5.0
+API_INTERVAL_BACKOFF = 1.25
+
+# Consecutive misses needed before backing off, so one bad frame during a
+# gesture doesn't slow polling down
+BACKOFF_AFTER_MISSES = 3
+
+# Each poll sends a short burst of frames spaced BURST_SPACING seconds apart
+# over the warm connection, to catch gestures that fall between polls. The
+# wait after a burst grows with its size, so the call rate stays the same.
+BURST_SIZE = 2
+BURST_SPACING = 0.2
 
 # Cooldown period after triggering volume up (seconds)
 COOLDOWN_PERIOD = 1.0
 
+# The OS never changes while we run, so look it up once instead of on every
+# volume change
+_SYSTEM = platform.system()
 
-def read_keys_from_file(path: str):
-    """
-    Reads Face++ credentials from a text file.
-    """
-    p = Path(path)
-
-    if not p.exists():
-        raise FileNotFoundError(
-            f"Keys file not found: {p.resolve()}\n"
-            "Create it with two lines:\n"
-            "API_KEY\\nAPI_SECRET"
-        )
-
-    lines = [ln.strip() for ln in p.read_text(encoding="utf-8").splitlines() if ln.strip()]
+# Full paths of the volume commands, resolved once (falls back to the bare
+# name so a missing tool still fails the same way inside increase_volume)
+_POWERSHELL = shutil.which("powershell") or "powershell"
+_OSASCRIPT = shutil.which("osascript") or "osascript"
+_AMIXER = shutil.which("amixer") or "amixer"
+_PACTL = shutil.which("pactl") or "pactl"
 
-    if len(lines) < 2:
-        raise ValueError(
-            "Keys file must contain at least 2 non-empty lines:\n"
-            "Line 1 = API_KEY\nLine 2 = API_SECRET"
-        )
+# Capture mode requested from the webcam. MJPG at 640x480 is cheap to
+# decode and already small enough to upload without resizing; cameras that
+# don't support it just keep their default mode.
+CAPTURE_FOURCC = "MJPG"
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
 
-    return lines[0], lines[1]
+# Preview window: max width, and only redraw every Nth frame
+PREVIEW_MAX_WIDTH = 640
+PREVIEW_EVERY_N_FRAMES = 2
 
+# Set HEADLESS=1 to run without the preview window (stop with Ctrl+C)
+HEADLESS = os.environ.get("HEADLESS") == "1"
 
-def post_to_facepp_gesture(api_key: str, api_secret: str, bgr_frame):
-    """
-    Sends the captured webcam frame to Face++ Gesture API.
-    """
-    try:
-        ok, jpg = cv2.imencode(".jpg", bgr_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
-        if not ok:
-            return None
+# A frame counts as "changed" since the last upload when more than this many
+# of its 64 dHash bits differ; frames with this many or fewer are not sent
+MOTION_THRESHOLD = 10
 
-        files = {
-            "image_file": ("frame.jpg", jpg.tobytes(), "image/jpeg")
-        }
+# How often to re-check for motion after skipping a still frame (seconds)
+MOTION_POLL_INTERVAL = 0.1
 
-        data = {
-            "api_key": api_key,
-            "api_secret": api_secret
-        }
+# Keep uploading a still scene this long after a thumbs up (seconds), so a
+# gesture held steady keeps raising the volume
+RECENT_TRIGGER_WINDOW = 5.0
 
-        resp = requests.post(FACEPP_US_GESTURE_URL, data=data, files=files, timeout=10)
 
-        payload = resp.json()
-
-        if resp.status_code != 200 or "error_message" in payload:
-            print(f"API error: {payload.get('error_message', 'Unknown error')}")
-            return None
-
-        return payload
-
-    except Exception as e:
-        print(f"Request error: {e}")
-        return None
-
-
-def detect_thumbs_up(payload: dict):
+@functools.lru_cache(maxsize=None)
+def windows_endpoint_volume():
     """
-    Checks if a thumbs-up gesture was detected in the Face++ response.
+    Returns the default speaker's IAudioEndpointVolume, or None if pycaw
+    isn't available. Bound once and reused for every volume change.
     """
-    if not payload:
-        return False
-
-    hands = payload.get("hands") or payload.get("hand_gestures") or payload.get("result") or []
+    if AudioUtilities is None:
+        return None
 
-    if isinstance(hands, dict):
-        hands = hands.get("hands", [])
+    try:
+        speakers = AudioUtilities.GetSpeakers()
 
-    if not hands:
-        return False
+        # Newer pycaw versions wrap the device and expose the endpoint directly
+        if getattr(speakers, "EndpointVolume", None) is not None:
+            return speakers.EndpointVolume
 
-    for hand in hands:
-        gesture = hand.get("gesture") or hand.get("gesture_type") or hand.get("label")
-        
-        if isinstance(gesture, dict):
-            thumb_up_score = gesture.get("thumb_up", 0)
-            
-            if thumb_up_score > 50:
-                print(f"👍 Thumbs up detected! Confidence: {thumb_up_score}%")
-                return True
-        
-        elif isinstance(gesture, str):
-            gesture_normalized = gesture.lower().replace("_", "").replace(" ", "")
-            if gesture_normalized in ["thumbup", "thumbsup"]:
-                print(f"👍 Thumbs up detected!")
-                return True
-
-    return False
+        interface = speakers.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        return interface.QueryInterface(IAudioEndpointVolume)
+    except Exception as e:
+        print(f"⚠️ pycaw unavailable, falling back to PowerShell: {e}")
+        return None
 
 
 def increase_volume():
     """
     Increases system volume using OS-specific commands.
     """
-    system = platform.system()
+    system = _SYSTEM
     
     try:
         if system == "Windows":
-            # Windows: Use NirCmd (needs to be installed) or PowerShell
-            # Method 1: Try PowerShell (built-in)
-            script = '''
-            $obj = New-Object -ComObject WScript.Shell
-            $obj.SendKeys([char]175)
-            '''
-            subprocess.run(["powershell", "-Command", script], check=True, capture_output=True)
+            endpoint = windows_endpoint_volume()
+            if endpoint is not None:
+                # Method 1: pycaw (in-process, no PowerShell start-up)
+                endpoint.VolumeStepUp(None)
+            else:
+                # Method 2: PowerShell (built-in)
+                script = '''
+                $obj = New-Object -ComObject WScript.Shell
+                $obj.SendKeys([char]175)
+                '''
+                subprocess.run([_POWERSHELL, "-Command", script], check=True, capture_output=True)
             print("🔊 Volume UP (Windows)")
             
         elif system == "Darwin":  # macOS
             # Increase volume by 10% (0-100 scale)
-            subprocess.run(["osascript", "-e", "set volume output volume (output volume of (get volume settings) + 10)"], check=True)
+            subprocess.run([_OSASCRIPT, "-e", "set volume output volume (output volume of (get volume settings) + 10)"], check=True)
             print("🔊 Volume UP (macOS)")
             
         elif system == "Linux":
             # Try multiple methods for Linux
             try:
                 # Method 1: amixer (ALSA)
-                subprocess.run(["amixer", "-D", "pulse", "sset", "Master", "5%+"], check=True, capture_output=True)
+                subprocess.run([_AMIXER, "-D", "pulse", "sset", "Master", "5%+"], check=True, capture_output=True)
                 print("🔊 Volume UP (Linux - amixer)")
             except:
                 try:
                     # Method 2: pactl (PulseAudio)
-                    subprocess.run(["pactl", "set-sink-volume", "@DEFAULT_SINK@", "+5%"], check=True, capture_output=True)
+                    subprocess.run([_PACTL, "set-sink-volume", "@DEFAULT_SINK@", "+5%"], check=True, capture_output=True)
                     print("🔊 Volume UP (Linux - pactl)")
                 except:
                     print("⚠️ Could not increase volume. Install alsa-utils or pulseaudio-utils")
@@ -162,52 +164,167 @@ def increase_volume():
         print(f"⚠️ Volume control error: {e}")
 
 
-def run_continuous_gesture_detection(api_key: str, api_secret: str, camera_index: int = 0):
+def take_latest_frame(frame_slot, slot_lock):
     """
-    Continuously captures frames from webcam and detects gestures.
+    Removes and returns the newest frame from the shared slot, or None.
     """
-    cap = cv2.VideoCapture(camera_index)
-    if not cap.isOpened():
-        raise RuntimeError(f"Could not open webcam (index={camera_index}).")
+    with slot_lock:
+        return frame_slot.pop() if frame_slot else None
 
-    system = platform.system()
-    print("\n" + "="*60)
-    print("GESTURE VOLUME CONTROL - Running")
-    print("="*60)
-    print(f"Operating System: {system}")
-    print("👍 Show a THUMBS UP gesture to increase volume")
-    print("⌨️  Press ESC to quit")
-    print("="*60 + "\n")
 
-    last_api_call = 0
-    last_trigger_time = 0
-
-    while True:
-        ok, frame = cap.read()
-        if not ok:
-            print("Failed to read from webcam.")
-            break
-
-        cv2.imshow("Gesture Volume Control (ESC to quit)", frame)
-
-        key = cv2.waitKey(1) & 0xFF
-        if key == 27:  # ESC
-            break
-
-        current_time = time.time()
+def upload_worker(api_key: str, api_secret: str, frame_slot, slot_lock, thumbs_up, stop):
+    """
+    Background thread that sends the latest webcam frame to Face++.
+
+    The capture loop keeps overwriting frame_slot with its newest frame; this
+    thread takes whatever is there, uploads a burst of BURST_SIZE frames and
+    sets the thumbs_up event when the gesture is detected. The wait between
+    bursts adapts to recent results, and frames that look the same as the
+    last uploaded one are skipped to save API calls (except shortly after a
+    detection, so a held gesture keeps working).
+    """
+    last_hash = None
+    last_detect_time = float("-inf")
+    interval = API_INTERVAL_START
+    recent = deque(maxlen=BACKOFF_AFTER_MISSES)
+
+    while not stop.is_set():
+        frame = take_latest_frame(frame_slot, slot_lock)
+
+        if frame is None:
+            # No frame captured yet, check again shortly
+            stop.wait(0.05)
+            continue
+
+        frame_hash = frame_dhash(frame)
+        unchanged = last_hash is not None and bin(frame_hash ^ last_hash).count("1") <= MOTION_THRESHOLD
+        triggered_recently = time.monotonic() - last_detect_time < RECENT_TRIGGER_WINDOW
+        if unchanged and not triggered_recently:
+            # Nothing moved since the last upload, look again shortly
+            stop.wait(MOTION_POLL_INTERVAL)
+            continue
+        last_hash = frame_hash
+
+        detected = detect_thumbs_up(post_to_facepp_gesture(api_key, api_secret, frame))
+        sent = 1
+
+        # Rest of the burst, from fresh frames, unless we already have a hit
+        for _ in range(BURST_SIZE - 1):
+            if detected or stop.wait(BURST_SPACING):
+                break
+
+            frame = take_latest_frame(frame_slot, slot_lock)
+            if frame is None:
+                break
+
+            last_hash = frame_dhash(frame)
+            detected = detect_thumbs_up(post_to_facepp_gesture(api_key, api_secret, frame))
+            sent += 1
+
+        recent.append(detected)
+
+        if detected:
+            thumbs_up.set()
+            last_detect_time = time.monotonic()
+            interval = API_INTERVAL_ACTIVE
+        elif len(recent) == recent.maxlen and not any(recent):
+            interval = min(interval * API_INTERVAL_BACKOFF, API_INTERVAL_MAX)
+
+        # Wait one interval per upload, counting the spacing already spent
+        # inside the burst, so bursting doesn't raise the average call rate
+        stop.wait(max(0.0, interval * sent - BURST_SPACING * (sent - 1)))
+
+
+@contextlib.contextmanager
+def open_camera(camera_index: int):
+    """
+    Opens the webcam, and always releases it and closes the preview window
+    on exit, even when an exception escapes the capture loop.
+    """
+    cap = cv2.VideoCapture(camera_index)
+    try:
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open webcam (index={camera_index}).")
 
-        if current_time - last_api_call >= API_CALL_INTERVAL:
-            last_api_call = current_time
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAPTURE_FOURCC))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
 
-            payload = post_to_facepp_gesture(api_key, api_secret, frame)
+        yield cap
+    finally:
+        cap.release()
+        # opencv-python-headless has no HighGUI, and raising here would
+        # replace whatever ended the loop (e.g. KeyboardInterrupt)
+        if not HEADLESS:
+            cv2.destroyAllWindows()
 
-            if detect_thumbs_up(payload):
-                if current_time - last_trigger_time >= COOLDOWN_PERIOD:
-                    increase_volume()
-                    last_trigger_time = current_time
 
-    cap.release()
-    cv2.destroyAllWindows()
+def run_continuous_gesture_detection(api_key: str, api_secret: str, camera_index: int = 0):
+    """
+    Continuously captures frames from webcam and detects gestures.
+    """
+    with open_camera(camera_index) as cap:
+        system = _SYSTEM
+        print("\n" + "="*60)
+        print("GESTURE VOLUME CONTROL - Running")
+        print("="*60)
+        print(f"Operating System: {system}")
+        print("👍 Show a THUMBS UP gesture to increase volume")
+        print("⌨️  Press Ctrl+C to quit" if HEADLESS else "⌨️  Press ESC to quit")
+        print("="*60 + "\n")
+
+        last_trigger_time = 0.0
+        frame_counter = 0
+
+        # Keep OpenCV from spinning up its own thread pool next to ours
+        cv2.setNumThreads(1)
+
+        # One-slot "latest frame" buffer shared with the upload thread. Old frames
+        # are dropped automatically, so uploads never fall behind the camera.
+        frame_slot = deque(maxlen=1)
+        slot_lock = threading.Lock()
+        thumbs_up = threading.Event()
+        stop = threading.Event()
+
+        worker = threading.Thread(
+            target=upload_worker,
+            args=(api_key, api_secret, frame_slot, slot_lock, thumbs_up, stop),
+            daemon=True
+        )
+        worker.start()
+
+        try:
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    print("Failed to read from webcam.")
+                    break
+
+                with slot_lock:
+                    frame_slot.append(frame)
+
+                if not HEADLESS:
+                    # Drawing the preview is costly, so shrink it and skip frames
+                    if frame_counter % PREVIEW_EVERY_N_FRAMES == 0:
+                        preview = shrink_to_width(frame, PREVIEW_MAX_WIDTH)
+                        cv2.imshow("Gesture Volume Control (ESC to quit)", preview)
+                    frame_counter += 1
+
+                    # waitKey runs the GUI event loop, so call it on every frame
+                    key = cv2.waitKey(1) & 0xFF
+                    if key == 27:  # ESC
+                        break
+
+                if thumbs_up.is_set():
+                    thumbs_up.clear()
+                    current_time = time.monotonic()
+
+                    if current_time - last_trigger_time >= COOLDOWN_PERIOD:
+                        increase_volume()
+                        last_trigger_time = current_time
+        finally:
+            # Let the upload thread exit even if the loop raised
+            stop.set()
 
 
 def main():
@@ -220,6 +337,8 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
+    warm_up_connection()
+
     try:
         run_continuous_gesture_detection(api_key, api_secret, camera_index=0)
     except KeyboardInterrupt:
@@ -5,101 +5,182 @@ A sleek, modern interface for controlling your computer's volume with hand gestu
 
 import sys
 import json
+import atexit
 import time
+import ctypes
 import platform
 import subprocess
 import threading
-from pathlib import Path
 from datetime import datetime
 
 import cv2
-import requests
+import numpy as np
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 
+from facepp_core import (
+    KEYS_FILE, read_keys_from_file, frame_dhash, post_to_facepp_gesture
+)
+
+# Optional (Linux only): pulsectl talks to PulseAudio in-process, which avoids
+# forking pactl/amixer on every volume change
+try:
+    import pulsectl
+except ImportError:
+    pulsectl = None
+
 
 # Face++ Configuration
-FACEPP_US_GESTURE_URL = "https://api-us.faceplusplus.com/humanbodypp/v1/gesture"
-KEYS_FILE = "facepp_keys.txt"
 API_CALL_INTERVAL = 2.0
 COOLDOWN_PERIOD = 1.0
+JPEG_QUALITY = 70            # Passed to facepp_core instead of its default quality
+THUMB_UP_THRESHOLD = 50      # Minimum Face++ thumb_up confidence (%) to count
+RETRIEVE_INTERVAL = 1 / 30   # Decode at most ~30 frames per second
+RETRIEVE_SLACK = RETRIEVE_INTERVAL / 2  # How early a frame may arrive and still be decoded
+PREVIEW_WIDTH = 600
+MOTION_THRESHOLD = 10        # Re-upload only when more than this many dHash bits (of 64) change
+RECENT_TRIGGER_WINDOW = 5.0  # Keep polling a still scene this long after a trigger
+
+# Capture mode requested from the webcam (ignored by cameras that can't do it)
+CAPTURE_FOURCC = 'MJPG'
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
+CAPTURE_FPS = 30
+
+# Volume control
+VK_VOLUME_UP = 0xAF          # Windows virtual-key code for the media Volume Up key
+KEYEVENTF_KEYUP = 0x0002
+MAC_VOLUME_UP_CMD = ["osascript", "-e",
+                     "set volume output volume (output volume of (get volume settings) + 10)"]
+LINUX_VOLUME_UP_CMD = ["pactl", "set-sink-volume", "@DEFAULT_SINK@", "+5%"]
+LINUX_AMIXER_VOLUME_UP_CMD = ["amixer", "-D", "pulse", "sset", "Master", "5%+"]
+LINUX_VOLUME_STEP = 0.05     # Same +5% step as the pactl/amixer commands
 
 
 class GestureVolumeApp:
     """Beautiful gesture-controlled volume application"""
     
+    PLACEHOLDER_TEXT = "📷\n\nCamera Inactive\n\nClick 'Start Detection' to begin"
+    PLACEHOLDER_FONT = ('Segoe UI', 14)
+    
+    # Color palette - soft, modern aesthetic
+    COLORS = {
+        'bg_primary': '#0F172A',      # Deep slate
+        'bg_secondary': '#1E293B',    # Lighter slate
+        'bg_card': '#334155',         # Card background
+        'accent': '#3B82F6',          # Bright blue
+        'accent_hover': '#2563EB',    # Darker blue
+        'success': '#10B981',         # Green
+        'warning': '#F59E0B',         # Amber
+        'text_primary': '#F8FAFC',    # Almost white
+        'text_secondary': '#94A3B8',  # Gray
+        'border': '#475569'           # Border gray
+    }
+    # Colors used on every start/stop
+    COLOR_ACTIVE = COLORS['success']
+    COLOR_INACTIVE = COLORS['text_secondary']
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Gesture Volume Control")
         self.root.geometry("900x650")
         self.root.resizable(False, False)
         
+        # Platform details, looked up once instead of on every volume change
+        self.system = platform.system()
+        self.user32 = ctypes.WinDLL('user32') if self.system == "Windows" else None
+        self.pulse = self.open_pulse() if self.system == "Linux" else None
+        
         # State variables
         self.is_running = False
         self.camera = None
+        # Newest decoded frame, published by the capture thread. retrieve()
+        # returns a new array every time and nobody writes into a published
+        # frame, so readers can take the reference without a lock or a copy.
+        self.latest_frame = None
+        self.capture_thread = None
+        self.stop_event = threading.Event()  # Wakes the capture thread on stop
+        self.shown_frame = None    # Frame currently drawn in the preview
+        self.preview_photo = None  # Reused PhotoImage, see prepare_preview_buffers
+        self.api_thread = None     # Daemon thread running the current Face++ call
+        self.session_id = 0        # Bumped on stop so late results are discarded
+        self.api_after_id = None
+        self.feed_after_id = None
+        self.stats_after_id = None
+        self.feed_period_ms = 30   # Preview refresh period, matched to the camera FPS
+        self.last_hash = None      # dHash of the last frame sent to Face++
         self.api_key = None
         self.api_secret = None
-        self.last_api_call = 0
-        self.last_trigger_time = 0
+        self.last_trigger_time = 0.0
         self.stats = {
             'gestures_detected': 0,
             'volume_changes': 0,
             'session_start': None
         }
+        self.shown_uptime = None   # (minutes, seconds) currently on the uptime label
+        self.visible = True        # False while the window is minimized
         
         # Setup UI
         self.setup_styles()
         self.create_ui()
         self.load_credentials()
         
+        # Pause uploads while minimized so we don't spend Face++ quota on nobody
+        self.root.bind("<Map>", self.on_map_change)
+        self.root.bind("<Unmap>", self.on_map_change)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        """Stop detection before the window (and Tk's mainloop) goes away"""
+        if self.is_running:
+            self.stop_detection()
+        self.root.destroy()
+        
+    def on_map_change(self, event):
+        """Track whether the main window is shown or minimized"""
+        # Child widgets inherit the root's bindings, so ignore their events
+        if event.widget is self.root:
+            self.visible = event.type == tk.EventType.Map
+        
     def setup_styles(self):
         """Configure modern color scheme and styles"""
-        # Color palette - soft, modern aesthetic
-        self.colors = {
-            'bg_primary': '#0F172A',      # Deep slate
-            'bg_secondary': '#1E293B',    # Lighter slate
-            'bg_card': '#334155',         # Card background
-            'accent': '#3B82F6',          # Bright blue
-            'accent_hover': '#2563EB',    # Darker blue
-            'success': '#10B981',         # Green
-            'warning': '#F59E0B',         # Amber
-            'text_primary': '#F8FAFC',    # Almost white
-            'text_secondary': '#94A3B8',  # Gray
-            'border': '#475569'           # Border gray
-        }
+        self.root.configure(bg=self.COLORS['bg_primary'])
         
-        self.root.configure(bg=self.colors['bg_primary'])
+        # ttk styles live in the Tk interpreter, so configure them once per root
+        if getattr(self.root, 'gesture_styles_ready', False):
+            return
+        self.root.gesture_styles_ready = True
         
         # Configure ttk styles
-        style = ttk.Style()
+        style = ttk.Style(self.root)
         style.theme_use('clam')
         
         # Button style
         style.configure(
             'Accent.TButton',
-            background=self.colors['accent'],
-            foreground=self.colors['text_primary'],
+            background=self.COLORS['accent'],
+            foreground=self.COLORS['text_primary'],
             borderwidth=0,
             focuscolor='none',
             font=('Segoe UI', 11, 'bold'),
             padding=(20, 12)
         )
         style.map('Accent.TButton',
-            background=[('active', self.colors['accent_hover'])]
+            background=[('active', self.COLORS['accent_hover'])]
         )
         
     def create_ui(self):
         """Build the modern UI layout"""
         # Main container
-        main_frame = tk.Frame(self.root, bg=self.colors['bg_primary'])
+        main_frame = tk.Frame(self.root, bg=self.COLORS['bg_primary'])
         main_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
         
         # Header
         self.create_header(main_frame)
         
         # Content area (camera + stats)
-        content_frame = tk.Frame(main_frame, bg=self.colors['bg_primary'])
+        content_frame = tk.Frame(main_frame, bg=self.COLORS['bg_primary'])
         content_frame.pack(fill=tk.BOTH, expand=True, pady=20)
         
         # Left: Camera preview
@@ -113,7 +194,7 @@ class GestureVolumeApp:
         
     def create_header(self, parent):
         """Create app header with title"""
-        header = tk.Frame(parent, bg=self.colors['bg_primary'])
+        header = tk.Frame(parent, bg=self.COLORS['bg_primary'])
         header.pack(fill=tk.X)
         
         # Title with emoji
@@ -121,8 +202,8 @@ class GestureVolumeApp:
             header,
             text="👋 Gesture Volume Control",
             font=('Segoe UI', 28, 'bold'),
-            fg=self.colors['text_primary'],
-            bg=self.colors['bg_primary']
+            fg=self.COLORS['text_primary'],
+            bg=self.COLORS['bg_primary']
         )
         title.pack(anchor='w')
         
@@ -131,21 +212,21 @@ class GestureVolumeApp:
             header,
             text="Control your volume with hand gestures",
             font=('Segoe UI', 12),
-            fg=self.colors['text_secondary'],
-            bg=self.colors['bg_primary']
+            fg=self.COLORS['text_secondary'],
+            bg=self.COLORS['bg_primary']
         )
         subtitle.pack(anchor='w', pady=(5, 0))
         
     def create_camera_section(self, parent):
         """Create camera preview area"""
-        camera_frame = tk.Frame(parent, bg=self.colors['bg_primary'])
+        camera_frame = tk.Frame(parent, bg=self.COLORS['bg_primary'])
         camera_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 15))
         
         # Camera card
         card = tk.Frame(
             camera_frame,
-            bg=self.colors['bg_secondary'],
-            highlightbackground=self.colors['border'],
+            bg=self.COLORS['bg_secondary'],
+            highlightbackground=self.COLORS['border'],
             highlightthickness=1
         )
         card.pack(fill=tk.BOTH, expand=True)
@@ -153,8 +234,8 @@ class GestureVolumeApp:
         # Camera label
         self.camera_label = tk.Label(
             card,
-            bg=self.colors['bg_secondary'],
-            fg=self.colors['text_secondary'],
+            bg=self.COLORS['bg_secondary'],
+            fg=self.COLORS['text_secondary'],
             font=('Segoe UI', 14),
             compound='none'  # Don't show text with images
         )
@@ -165,14 +246,14 @@ class GestureVolumeApp:
         
     def create_stats_section(self, parent):
         """Create statistics and info panel"""
-        stats_frame = tk.Frame(parent, bg=self.colors['bg_primary'])
+        stats_frame = tk.Frame(parent, bg=self.COLORS['bg_primary'])
         stats_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(15, 0))
         
         # Stats card
         card = tk.Frame(
             stats_frame,
-            bg=self.colors['bg_secondary'],
-            highlightbackground=self.colors['border'],
+            bg=self.COLORS['bg_secondary'],
+            highlightbackground=self.COLORS['border'],
             highlightthickness=1,
             width=280
         )
@@ -184,45 +265,49 @@ class GestureVolumeApp:
             card,
             text="Session Stats",
             font=('Segoe UI', 16, 'bold'),
-            fg=self.colors['text_primary'],
-            bg=self.colors['bg_secondary']
+            fg=self.COLORS['text_primary'],
+            bg=self.COLORS['bg_secondary']
         )
         title.pack(anchor='w', padx=20, pady=(20, 15))
         
         # Status indicator
-        self.status_frame = tk.Frame(card, bg=self.colors['bg_secondary'])
+        self.status_frame = tk.Frame(card, bg=self.COLORS['bg_secondary'])
         self.status_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
         
         self.status_dot = tk.Canvas(
             self.status_frame,
             width=12,
             height=12,
-            bg=self.colors['bg_secondary'],
+            bg=self.COLORS['bg_secondary'],
             highlightthickness=0
         )
         self.status_dot.pack(side=tk.LEFT, padx=(0, 8))
-        self.status_dot.create_oval(2, 2, 10, 10, fill=self.colors['text_secondary'], outline='')
+        self.status_dot.create_oval(2, 2, 10, 10, fill=self.COLORS['text_secondary'], outline='')
         
         self.status_label = tk.Label(
             self.status_frame,
             text="Inactive",
             font=('Segoe UI', 11),
-            fg=self.colors['text_secondary'],
-            bg=self.colors['bg_secondary']
+            fg=self.COLORS['text_secondary'],
+            bg=self.COLORS['bg_secondary']
         )
         self.status_label.pack(side=tk.LEFT)
         
         # Separator
-        sep = tk.Frame(card, bg=self.colors['border'], height=1)
+        sep = tk.Frame(card, bg=self.COLORS['border'], height=1)
         sep.pack(fill=tk.X, padx=20, pady=15)
         
         # Stats items
         self.gestures_label = self.create_stat_item(card, "👍 Gestures Detected", "0")
         self.volume_label = self.create_stat_item(card, "🔊 Volume Changes", "0")
         self.uptime_label = self.create_stat_item(card, "⏱️ Session Time", "00:00")
+        self.stat_labels = {
+            'gestures_detected': self.gestures_label,
+            'volume_changes': self.volume_label,
+        }
         
         # Separator
-        sep2 = tk.Frame(card, bg=self.colors['border'], height=1)
+        sep2 = tk.Frame(card, bg=self.COLORS['border'], height=1)
         sep2.pack(fill=tk.X, padx=20, pady=15)
         
         # Instructions
@@ -230,8 +315,8 @@ class GestureVolumeApp:
             card,
             text="How to use:",
             font=('Segoe UI', 12, 'bold'),
-            fg=self.colors['text_primary'],
-            bg=self.colors['bg_secondary']
+            fg=self.COLORS['text_primary'],
+            bg=self.COLORS['bg_secondary']
         )
         instructions.pack(anchor='w', padx=20, pady=(10, 5))
         
@@ -239,23 +324,23 @@ class GestureVolumeApp:
             card,
             text="• Click 'Start Detection'\n• Show thumbs up 👍\n• Volume increases!",
             font=('Segoe UI', 10),
-            fg=self.colors['text_secondary'],
-            bg=self.colors['bg_secondary'],
+            fg=self.COLORS['text_secondary'],
+            bg=self.COLORS['bg_secondary'],
             justify=tk.LEFT
         )
         inst_text.pack(anchor='w', padx=20)
         
     def create_stat_item(self, parent, label, value):
         """Create a stat display item"""
-        frame = tk.Frame(parent, bg=self.colors['bg_secondary'])
+        frame = tk.Frame(parent, bg=self.COLORS['bg_secondary'])
         frame.pack(fill=tk.X, padx=20, pady=8)
         
         label_widget = tk.Label(
             frame,
             text=label,
             font=('Segoe UI', 10),
-            fg=self.colors['text_secondary'],
-            bg=self.colors['bg_secondary']
+            fg=self.COLORS['text_secondary'],
+            bg=self.COLORS['bg_secondary']
         )
         label_widget.pack(anchor='w')
         
@@ -263,8 +348,8 @@ class GestureVolumeApp:
             frame,
             text=value,
             font=('Segoe UI', 18, 'bold'),
-            fg=self.colors['text_primary'],
-            bg=self.colors['bg_secondary']
+            fg=self.COLORS['text_primary'],
+            bg=self.COLORS['bg_secondary']
         )
         value_widget.pack(anchor='w', pady=(2, 0))
         
@@ -272,7 +357,7 @@ class GestureVolumeApp:
         
     def create_controls(self, parent):
         """Create control buttons"""
-        controls = tk.Frame(parent, bg=self.colors['bg_primary'])
+        controls = tk.Frame(parent, bg=self.COLORS['bg_primary'])
         controls.pack(fill=tk.X, pady=(20, 0))
         
         self.start_button = ttk.Button(
@@ -286,20 +371,17 @@ class GestureVolumeApp:
     def show_camera_placeholder(self):
         """Show placeholder when camera is off"""
         self.camera_label.configure(
-            text="📷\n\nCamera Inactive\n\nClick 'Start Detection' to begin",
-            font=('Segoe UI', 14)
+            text=self.PLACEHOLDER_TEXT,
+            font=self.PLACEHOLDER_FONT
         )
         
     def load_credentials(self):
         """Load Face++ API credentials"""
         try:
-            p = Path(KEYS_FILE)
-            if not p.exists():
-                return
-            
-            lines = [ln.strip() for ln in p.read_text(encoding="utf-8").splitlines() if ln.strip()]
-            if len(lines) >= 2:
-                self.api_key, self.api_secret = lines[0], lines[1]
+            self.api_key, self.api_secret = read_keys_from_file(KEYS_FILE)
+        except FileNotFoundError:
+            # start_detection explains how to create the file
+            return
         except Exception as e:
             print(f"Error loading credentials: {e}")
             
@@ -326,24 +408,47 @@ class GestureVolumeApp:
                 if not self.camera.isOpened():
                     raise RuntimeError("Could not open webcam or camera is being used by another app.")
                     
+                # Ask for small MJPG frames, and keep the driver queue to one
+                # frame so the preview never lags behind the camera
+                self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAPTURE_FOURCC))
+                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
+                self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                self.camera.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
+                
+                # Refresh the preview at the rate the camera actually delivers,
+                # but never faster than capture_loop decodes
+                fps = self.camera.get(cv2.CAP_PROP_FPS)
+                self.feed_period_ms = max(round(1000 / fps) if fps > 0 else 30,
+                                          round(RETRIEVE_INTERVAL * 1000))
+                
                 # Set operational states
                 self.is_running = True
-                self.current_frame = None  # Shared resource for the detection thread
-                self.stats['session_start'] = time.time()
-                self.stats['gestures_detected'] = 0
-                self.stats['volume_changes'] = 0
+                # A fresh event per session, so a capture thread from an earlier
+                # session that is still stuck in grab() stays stopped
+                self.stop_event = threading.Event()
+                self.latest_frame = None
+                self.shown_frame = None
+                self.stats['session_start'] = time.monotonic()
+                self.set_stat('gestures_detected', 0)
+                self.set_stat('volume_changes', 0)
+                self.shown_uptime = None
                 
                 # Update UI elements
                 self.start_button.configure(text="Stop Detection")
                 self.update_status(True)
                 
-                # 1. Start background thread for API calls
-                thread = threading.Thread(target=self.detection_loop, daemon=True)
-                thread.start()
+                # 1. Start background thread for frame capture and the API worker
+                self.capture_thread = threading.Thread(
+                    target=self.capture_loop, args=(self.camera, self.stop_event), daemon=True
+                )
+                self.capture_thread.start()
+                self.last_hash = None
                 
                 # 2. Start the UI recursive loops
-                self.update_camera_feed()  # Handles frame captures and display
+                self.update_camera_feed()  # Handles frame display
                 self.update_stats()        # Handles session timer and counters
+                self.api_after_id = self.root.after(int(API_CALL_INTERVAL * 1000), self.tick_api)
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to start: {e}")
@@ -352,10 +457,33 @@ class GestureVolumeApp:
     def stop_detection(self):
         """Stop gesture detection"""
         self.is_running = False
+        self.stop_event.set()
         
-        if self.camera:
+        if self.api_after_id:
+            self.root.after_cancel(self.api_after_id)
+            self.api_after_id = None
+            
+        if self.feed_after_id:
+            self.root.after_cancel(self.feed_after_id)
+            self.feed_after_id = None
+            
+        if self.stats_after_id:
+            self.root.after_cancel(self.stats_after_id)
+            self.stats_after_id = None
+            
+        # A request still in flight belongs to the old session now; its
+        # daemon thread finishes on its own and its result is ignored
+        self.session_id += 1
+        
+        # capture_loop releases the camera when it exits, so release() can't
+        # race a grab() that is stuck in the driver
+        if self.capture_thread:
+            self.capture_thread.join(timeout=1.0)
+            self.capture_thread = None
+        elif self.camera:
+            # start_detection failed before the capture thread came up
             self.camera.release()
-            self.camera = None
+        self.camera = None
             
         self.start_button.configure(text="Start Detection")
         self.update_status(False)
@@ -364,142 +492,258 @@ class GestureVolumeApp:
     def update_status(self, active):
         """Update status indicator"""
         if active:
-            self.status_dot.itemconfig(1, fill=self.colors['success'])
+            self.status_dot.itemconfig(1, fill=self.COLOR_ACTIVE)
             self.status_label.configure(
                 text="Active",
-                fg=self.colors['success']
+                fg=self.COLOR_ACTIVE
             )
         else:
-            self.status_dot.itemconfig(1, fill=self.colors['text_secondary'])
+            self.status_dot.itemconfig(1, fill=self.COLOR_INACTIVE)
             self.status_label.configure(
                 text="Inactive",
-                fg=self.colors['text_secondary']
+                fg=self.COLOR_INACTIVE
             )
             
-    def detection_loop(self):
-        """Main detection loop - now uses the frame from the UI thread"""
-        while self.is_running:
-            current_time = time.time()
+    def capture_loop(self, camera, stop_event):
+        """Capture thread - grabs every frame, decodes only the ones we use"""
+        try:
+            self.capture_frames(camera, stop_event)
+        finally:
+            # Only this thread touches the camera, so it is the one to release it
+            camera.release()
             
-            # Check if it's time to call API and if we have a frame available
-            if (current_time - self.last_api_call >= API_CALL_INTERVAL and 
-                hasattr(self, 'current_frame')):
+    def capture_frames(self, camera, stop_event):
+        """Grab/retrieve loop run by capture_loop until stop_event is set"""
+        # Bound once - this loop runs for every frame the camera delivers
+        grab = camera.grab
+        retrieve = camera.retrieve
+        stopped = stop_event.is_set
+        wait = stop_event.wait
+        monotonic = time.monotonic
+        next_retrieve = 0.0
+        
+        while not stopped():
+            # grab() keeps the driver queue drained without the cost of a decode
+            if not grab():
+                # Back off briefly, but return as soon as stop_detection signals
+                if wait(0.01):
+                    break
+                continue
                 
-                self.last_api_call = current_time
-                # Use the frame stored by the camera update function
-                payload = self.call_gesture_api(self.current_frame)
-                
-                if self.detect_thumbs_up(payload):
-                    self.stats['gestures_detected'] += 1
+            # Decode on a fixed schedule with some slack: a 30 fps camera's
+            # frames arrive jittered around the deadline, and a strict
+            # "interval since last decode" check would drop the early ones
+            now = monotonic()
+            if now >= next_retrieve - RETRIEVE_SLACK:
+                ok, frame = retrieve()
+                if ok and not stopped():
+                    self.latest_frame = frame
+                    # Restart the schedule from now if we fell behind
+                    next_retrieve = max(next_retrieve, now) + RETRIEVE_INTERVAL
                     
-                    if current_time - self.last_trigger_time >= COOLDOWN_PERIOD:
-                        self.increase_volume()
-                        self.stats['volume_changes'] += 1
-                        self.last_trigger_time = current_time
-                                    
-            time.sleep(0.1)
+    def tick_api(self):
+        """Submit the latest frame to Face++ every API_CALL_INTERVAL (Tk thread)"""
+        if not self.is_running:
+            return
+            
+        frame = self.latest_frame
+            
+        # Skip this tick if the previous request (even one from an earlier
+        # session) hasn't come back yet, or if
+        # nothing has changed since the last upload (unless the user just
+        # triggered, so a held thumbs up keeps working). Nothing is sent while
+        # the window is minimized.
+        if (self.visible and frame is not None and
+                (self.api_thread is None or not self.api_thread.is_alive())):
+            frame_hash = frame_dhash(frame)
+            unchanged = (self.last_hash is not None and
+                         bin(frame_hash ^ self.last_hash).count("1") <= MOTION_THRESHOLD)
+            triggered_recently = time.monotonic() - self.last_trigger_time < RECENT_TRIGGER_WINDOW
+            
+            if not unchanged or triggered_recently:
+                self.last_hash = frame_hash
+                # A daemon thread, so closing the window mid-request exits at once
+                self.api_thread = threading.Thread(
+                    target=self.api_worker, args=(frame, self.session_id), daemon=True
+                )
+                self.api_thread.start()
+            
+        self.api_after_id = self.root.after(int(API_CALL_INTERVAL * 1000), self.tick_api)
+        
+    def api_worker(self, frame, session):
+        """Worker thread - run one Face++ call and hand the result to the Tk thread"""
+        try:
+            result = self.do_api_call(frame, session)
+        except Exception:
+            return
+        if session != self.session_id:
+            return
+        try:
+            self.root.after(0, self.handle_api_result, session, *result)
+        except RuntimeError:
+            pass  # The window closed while we were posting
+            
+    def do_api_call(self, frame, session):
+        """Worker thread - call Face++ and raise the volume on a thumbs up"""
+        if not self.detect_thumbs_up(self.call_gesture_api(frame)):
+            return False, False
+            
+        # Detection was stopped while the request was in flight
+        if session != self.session_id:
+            return True, False
+            
+        current_time = time.monotonic()
+        if current_time - self.last_trigger_time < COOLDOWN_PERIOD:
+            return True, False
+            
+        self.increase_volume()
+        self.last_trigger_time = current_time
+        return True, True
+        
+    def handle_api_result(self, session, detected, volume_changed):
+        """Record an API result in the session stats (Tk thread)"""
+        if session != self.session_id:
+            return
+        if detected:
+            self.set_stat('gestures_detected', self.stats['gestures_detected'] + 1)
+        if volume_changed:
+            self.set_stat('volume_changes', self.stats['volume_changes'] + 1)
+            
+    def set_stat(self, key, value):
+        """Store a session counter, touching its label only when it changes"""
+        if self.stats[key] == value:
+            return
+        self.stats[key] = value
+        self.stat_labels[key].configure(text=str(value))
             
     def update_camera_feed(self):
-        """Update camera preview and store current frame for API"""
+        """Update camera preview from the latest captured frame"""
         if self.is_running and self.camera and self.camera.isOpened():
-            ret, frame = self.camera.read()
-            if ret:
-                # Store the raw frame for the detection thread to use
-                self.current_frame = frame.copy()
+            frame = self.latest_frame
                 
-                # Convert BGR to RGB for Tkinter
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Only redraw when the capture thread has produced a new frame
+            if frame is not None and frame is not self.shown_frame:
+                self.shown_frame = frame
                 
-                # Resize
-                h, w = frame_rgb.shape[:2]
-                target_w = 600
-                target_h = int(h * (target_w / w))
-                frame_resized = cv2.resize(frame_rgb, (target_w, target_h))
+                h, w = frame.shape[:2]
+                target_h = int(h * (PREVIEW_WIDTH / w))
+                if self.preview_photo is None or self.preview_buf.shape[0] != target_h:
+                    self.prepare_preview_buffers(target_h)
+                    
+                # Resize first so the color conversion only touches preview-sized
+                # pixels, then convert BGR to RGBA for Tkinter. Both write into
+                # the preallocated buffers.
+                small_buf = self.small_buf
+                cv2.resize(frame, (PREVIEW_WIDTH, target_h), dst=small_buf,
+                           interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(small_buf, cv2.COLOR_BGR2RGBA, dst=self.preview_buf)
                 
-                # Update Image
-                img = Image.fromarray(frame_resized)
-                photo = ImageTk.PhotoImage(image=img)
-                self.camera_label.configure(image=photo)
-                self.camera_label.image = photo
+                # preview_image shares memory with preview_buf, so no PIL image
+                # is built per frame. paste() still copies it into a temporary
+                # block first (Pillow only uses mapped images directly when they
+                # are block-allocated), then updates the existing Tk image.
+                self.preview_photo.paste(self.preview_image)
                 
-            self.root.after(30, self.update_camera_feed)
+            self.feed_after_id = self.root.after(self.feed_period_ms, self.update_camera_feed)
         else:
+            self.feed_after_id = None
             self.show_camera_placeholder()
 
             
+    def prepare_preview_buffers(self, target_h):
+        """Allocate the preview buffers and Tk image once per preview size"""
+        self.small_buf = np.empty((target_h, PREVIEW_WIDTH, 3), np.uint8)
+        self.preview_buf = np.empty((target_h, PREVIEW_WIDTH, 4), np.uint8)
+        
+        # RGBA (unlike RGB) lets PIL wrap the numpy buffer without copying it
+        self.preview_image = Image.frombuffer(
+            'RGBA', (PREVIEW_WIDTH, target_h), self.preview_buf, 'raw', 'RGBA', 0, 1
+        )
+        self.preview_photo = ImageTk.PhotoImage(self.preview_image)
+        self.camera_label.configure(image=self.preview_photo)
+        self.camera_label.image = self.preview_photo
+        
     def update_stats(self):
-        """Update statistics display"""
+        """Update the session time display (counters update themselves)"""
         if self.is_running:
-            # Update gesture count
-            self.gestures_label.configure(text=str(self.stats['gestures_detected']))
-            
-            # Update volume changes
-            self.volume_label.configure(text=str(self.stats['volume_changes']))
-            
-            # Update uptime
             if self.stats['session_start']:
-                elapsed = int(time.time() - self.stats['session_start'])
-                minutes = elapsed // 60
-                seconds = elapsed % 60
-                self.uptime_label.configure(text=f"{minutes:02d}:{seconds:02d}")
+                elapsed = int(time.monotonic() - self.stats['session_start'])
+                minutes, seconds = divmod(elapsed, 60)
+                if (minutes, seconds) != self.shown_uptime:
+                    self.shown_uptime = (minutes, seconds)
+                    self.uptime_label.configure(text=f"{minutes:02d}:{seconds:02d}")
                 
-            self.root.after(1000, self.update_stats)  # Update every second
+            self.stats_after_id = self.root.after(1000, self.update_stats)  # Update every second
             
     def call_gesture_api(self, frame):
-        """Call Face++ API"""
-        try:
-            ok, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
-            if not ok:
-                return None
-                
-            files = {"image_file": ("frame.jpg", jpg.tobytes(), "image/jpeg")}
-            data = {"api_key": self.api_key, "api_secret": self.api_secret}
-            
-            resp = requests.post(FACEPP_US_GESTURE_URL, data=data, files=files, timeout=10)
-            payload = resp.json()
-            
-            if resp.status_code == 200 and "error_message" not in payload:
-                return payload
-        except:
-            pass
-        return None
+        """Worker thread - encode the raw frame and call Face++ API
+        
+        tick_api only hands over the ndarray; keeping the JPEG encode here
+        means the Tk thread never pays for it. facepp_core shrinks, encodes
+        and posts it over the same keep-alive session the CLI uses.
+        """
+        return post_to_facepp_gesture(self.api_key, self.api_secret, frame, JPEG_QUALITY)
         
     def detect_thumbs_up(self, payload):
         """Check for thumbs up gesture"""
         if not payload:
             return False
             
-        hands = payload.get("hands") or []
+        hands = payload.get("hands")
         if isinstance(hands, dict):
-            hands = hands.get("hands", [])
+            hands = hands.get("hands", ())
+        if not hands:
+            return False
             
+        # Common shape: {"hands": [{"gesture": {"thumb_up": 97.1, ...}}]}
         for hand in hands:
-            gesture = hand.get("gesture") or {}
-            if isinstance(gesture, dict):
-                if gesture.get("thumb_up", 0) > 50:
-                    return True
+            gesture = hand.get("gesture")
+            if type(gesture) is dict and gesture.get("thumb_up", 0) > THUMB_UP_THRESHOLD:
+                return True
         return False
         
     def increase_volume(self):
         """Increase system volume"""
-        system = platform.system()
+        system = self.system
         try:
             if system == "Windows":
-                script = '$obj = New-Object -ComObject WScript.Shell; $obj.SendKeys([char]175)'
-                subprocess.run(["powershell", "-Command", script], check=True, capture_output=True)
+                # Tap the media Volume Up key in-process - no PowerShell start-up
+                self.user32.keybd_event(VK_VOLUME_UP, 0, 0, 0)
+                self.user32.keybd_event(VK_VOLUME_UP, 0, KEYEVENTF_KEYUP, 0)
             elif system == "Darwin":
-                subprocess.run(["osascript", "-e", 
-                    "set volume output volume (output volume of (get volume settings) + 10)"], 
-                    check=True)
+                # Fire and forget, osascript takes a moment to start
+                subprocess.Popen(MAC_VOLUME_UP_CMD)
             elif system == "Linux":
+                pulse = self.pulse
+                if pulse is not None:
+                    try:
+                        # Look the default sink up each time: it carries the current
+                        # volume, and the default device may have changed since
+                        sink = pulse.get_sink_by_name(pulse.server_info().default_sink_name)
+                        pulse.volume_change_all_chans(sink, LINUX_VOLUME_STEP)
+                        return
+                    except Exception:
+                        pass  # e.g. PulseAudio restarted; use pactl below
                 try:
-                    subprocess.run(["amixer", "-D", "pulse", "sset", "Master", "5%+"], 
-                        check=True, capture_output=True)
-                except:
-                    subprocess.run(["pactl", "set-sink-volume", "@DEFAULT_SINK@", "+5%"], 
-                        check=True, capture_output=True)
+                    # Fire and forget, like the macOS branch
+                    subprocess.Popen(LINUX_VOLUME_UP_CMD, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL)
+                except OSError:
+                    subprocess.Popen(LINUX_AMIXER_VOLUME_UP_CMD, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL)
         except:
             pass
+            
+    def open_pulse(self):
+        """Connect to PulseAudio once, or return None if pulsectl can't"""
+        if pulsectl is None:
+            return None
+        try:
+            pulse = pulsectl.Pulse('gesture-volume-control')
+        except Exception:
+            return None
+        atexit.register(pulse.close)
+        return pulse
 
 
 def main():